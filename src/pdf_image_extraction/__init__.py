@@ -10,10 +10,27 @@ Email: phillipe.cardenuto@gmail.com
 
 __version__ = "1.0.0"
 
-from .core.extractor import PDFExtractor
-from .core.image_embedded import ImageEmbedded
-
 __all__ = [
     "PDFExtractor",
     "ImageEmbedded",
 ]
+
+# Submodule that provides each lazily imported attribute (PEP 562).
+_LAZY_IMPORTS = {
+    "PDFExtractor": ".core.extractor",
+    "ImageEmbedded": ".core.image_embedded",
+}
+
+
+def __getattr__(name):
+    """Import PDFExtractor/ImageEmbedded lazily on first attribute access.
+
+    Keeps `import pdf_image_extraction` cheap (no PyMuPDF/Pillow/NumPy load)
+    when only metadata such as __version__ is needed.
+    """
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
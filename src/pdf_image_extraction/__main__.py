@@ -0,0 +1,9 @@
+"""Allow ``python -m pdf_image_extraction`` to run the CLI directly.
+
+Skips the setuptools console-script wrapper, which shaves startup time
+in containers and short-lived invocations.
+"""
+
+from .cli.extract_images import main
+
+main()
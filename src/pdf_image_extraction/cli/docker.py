@@ -1,173 +1,133 @@
 """
 CLI module for Docker and command-line operations.
 
-Provides environment variable support for Docker deployment.
+Provides environment variable support for Docker deployment. The flag-based
+CLI is shared with ``extract_images``; this module only adds the ``--env``
+switch on top of it.
 """
 
 import os
 import sys
-import argparse
 
-from pdf_image_extraction.core import PDFExtractor
+from .extract_images import _build_parser as _build_base_parser, main as _main
 
 
 def extract_with_env():
     """
     Extract images using environment variables.
-    
+
     Supports Docker environment variables:
     - INPUT_PATH: Path to PDF file (required)
     - OUTPUT_PATH: Output directory (default: /OUTPUT)
     - EXTRACTION_MODE: safe|normal|unsafe (default: normal)
-    
+
     This function is useful for Docker ENTRYPOINT configuration.
     """
+    from pdf_image_extraction.core.constants import VALID_MODES
+
     input_path = os.environ.get('INPUT_PATH')
     output_path = os.environ.get('OUTPUT_PATH', '/OUTPUT')
     mode = os.environ.get('EXTRACTION_MODE', 'normal')
-    
+
     if not input_path:
         print("Error: INPUT_PATH environment variable not set", file=sys.stderr)
         sys.exit(1)
-    
-    if not os.path.exists(input_path):
+
+    if mode not in VALID_MODES:
+        print(f"Error: invalid EXTRACTION_MODE: {mode}", file=sys.stderr)
+        sys.exit(1)
+
+    # Single stat instead of os.path.exists (which stats and discards)
+    try:
+        os.stat(input_path)
+    except FileNotFoundError:
         print(f"Error: PDF file not found: {input_path}", file=sys.stderr)
         sys.exit(1)
-    
-    os.makedirs(output_path, exist_ok=True)
-    
+
+    # The usual /OUTPUT case has no intermediate parents to create, so a
+    # bare mkdir avoids the per-parent stats makedirs performs
+    if os.path.dirname(output_path) == '/':
+        try:
+            os.mkdir(output_path)
+        except FileExistsError:
+            pass
+    else:
+        os.makedirs(output_path, exist_ok=True)
+
     try:
         print(f"Extracting images from: {input_path}")
         print(f"Mode: {mode}")
         print(f"Output: {output_path}")
-        
+
+        # Deferred so importing this module stays cheap
+        from pdf_image_extraction.core.extractor import PDFExtractor
+
         extractor = PDFExtractor(input_path)
-        
-        if mode == 'safe':
-            extractor.safe_mode(pdf=input_path, dir_path=output_path)
-        elif mode == 'unsafe':
-            extractor.unsafe_mode(pdf=input_path, dir_path=output_path)
-        else:  # normal
-            extractor.normal_mode(pdf=input_path, dir_path=output_path)
-        
+
+        dispatch = {
+            'safe': extractor.safe_mode,
+            'normal': extractor.normal_mode,
+            'unsafe': extractor.unsafe_mode,
+        }
+        dispatch[mode](pdf=input_path, dir_path=output_path)
+
         print("✓ Extraction complete")
         return 0
-        
+
     except Exception as e:
         print(f"✗ Extraction failed: {str(e)}", file=sys.stderr)
         return 1
 
 
-def create_parser():
+def augment_parser(parser):
     """
-    Create and return the argument parser for the CLI.
+    Add the Docker-specific ``--env`` flag to a shared CLI parser.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        Parser created by ``extract_images.create_parser``.
 
     Returns
     -------
     argparse.ArgumentParser
-        Configured argument parser.
+        The same parser, extended in place.
     """
-    parser = argparse.ArgumentParser(
-        prog='extract-images',
-        description='Extract images from PDF documents',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Extract from single PDF
-  %(prog)s -i input.pdf -o ./output
-  
-  # Extract with specific mode
-  %(prog)s -i /path/to/pdf.pdf -o ./output -m safe
-  
-  # Extract from multiple PDFs
-  %(prog)s -i doc1.pdf doc2.pdf -o ./output -m normal
-  
-  # Using environment variables (Docker)
-  export INPUT_PATH=/path/to/pdf.pdf
-  export OUTPUT_PATH=/path/to/output
-  export EXTRACTION_MODE=normal
-  %(prog)s --env
-        """
-    )
-
-    parser.add_argument(
-        '--input-path', '-i',
-        nargs='+',
-        help='Path to PDF file(s) or directory containing PDFs'
-    )
-
-    parser.add_argument(
-        '--output-path', '-o',
-        type=str,
-        default='.',
-        help='Output directory for extracted images (default: current directory)'
-    )
-
-    parser.add_argument(
-        '--mode', '-m',
-        type=str,
-        default='normal',
-        choices=['safe', 'normal', 'unsafe'],
-        help="""
-Extraction mode:
-  safe   - Extract only xreferred images (most conservative)
-  normal - Extract with duplicate/corruption detection (default, recommended)
-  unsafe - Extract all images without warranty (not recommended)
-        """
-    )
-
     parser.add_argument(
         '--env',
         action='store_true',
         help='Use environment variables (INPUT_PATH, OUTPUT_PATH, EXTRACTION_MODE)'
     )
-
-    parser.add_argument(
-        '--verbose', '-v',
-        action='store_true',
-        help='Enable verbose output'
-    )
-
     return parser
 
 
-def main():
-    """Main entry point for the CLI."""
-    parser = create_parser()
-    args = parser.parse_args()
+_PARSER = None
 
-    # If --env flag is set, use environment variables
-    if args.env:
-        if args.verbose:
-            print("Using environment variables mode")
-        sys.exit(extract_with_env())
 
-    # Otherwise, use command-line arguments
-    if not args.input_path:
-        parser.print_help()
-        sys.exit(1)
+def create_parser():
+    """
+    Create the argument parser for the Docker CLI.
 
-    try:
-        if args.verbose:
-            print(f"Mode: {args.mode}")
-            print(f"Input: {args.input_path}")
-            print(f"Output: {args.output_path}")
+    Returns
+    -------
+    argparse.ArgumentParser
+        The shared extract-images parser extended with ``--env``.
+    """
+    global _PARSER
+    if _PARSER is None:
+        # Build a fresh base parser (not the cached one) so --env does
+        # not leak into the parser that extract_images hands out.
+        _PARSER = augment_parser(_build_base_parser())
+    return _PARSER
 
-        extractor = PDFExtractor(input_path=args.input_path)
-        extractor.extract_all(out_name=args.output_path, mode=args.mode)
 
-        if args.verbose:
-            print("✓ Extraction completed successfully!")
+def main():
+    """Main entry point for the CLI."""
+    # --env ignores all other flags, so branch before any parsing happens
+    if '--env' in sys.argv[1:]:
+        sys.exit(extract_with_env())
 
-    except IOError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
-    except ValueError as e:
-        print(f"Invalid argument: {e}", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"Unexpected error: {e}", file=sys.stderr)
-        sys.exit(1)
+    _main()
 
 
 if __name__ == "__main__":
@@ -4,21 +4,35 @@ Command-line interface for PDF image extraction.
 Provides the main entry point for running image extraction from PDF files.
 """
 
-import argparse
 import sys
 
-from pdf_image_extraction.core import PDFExtractor
+from pdf_image_extraction.core.constants import VALID_MODES
+
+_PARSER = None
 
 
 def create_parser():
     """
     Create and return the argument parser for the CLI.
 
+    The parser is stateless after construction, so repeated in-process
+    invocations reuse the cached instance.
+
     Returns
     -------
     argparse.ArgumentParser
         Configured argument parser.
     """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+
+def _build_parser():
+    """Construct a fresh parser (argparse itself is imported on demand)."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog='extract-images',
         description='Extract images from PDF documents',
@@ -49,7 +63,7 @@ Examples:
         '--mode', '-m',
         type=str,
         default='normal',
-        choices=['safe', 'normal', 'unsafe'],
+        choices=sorted(VALID_MODES),
         help="""
 Extraction mode:
   safe   - Extract only xreferred images (most conservative)
@@ -67,8 +81,22 @@ Extraction mode:
     return parser
 
 
+def _extract_one(input_path, output_path, mode):
+    """Extract a single input in its own process (must stay picklable)."""
+    from pdf_image_extraction.core.extractor import PDFExtractor
+
+    extractor = PDFExtractor(input_path=[input_path])
+    extractor.extract_all(out_name=output_path, mode=mode)
+
+
 def main():
     """Main entry point for the CLI."""
+    # Misinvocation fast path: no arguments at all never needs argparse
+    if len(sys.argv) == 1:
+        print("usage: extract-images -i PDF [PDF ...] [-o DIR] [-m MODE]",
+              file=sys.stderr)
+        sys.exit(1)
+
     parser = create_parser()
     args = parser.parse_args()
 
@@ -78,8 +106,25 @@ def main():
             print(f"Input: {args.input_path}")
             print(f"Output: {args.output_path}")
 
-        extractor = PDFExtractor(input_path=args.input_path)
-        extractor.extract_all(out_name=args.output_path, mode=args.mode)
+        if len(args.input_path) > 1:
+            # Multiple inputs are embarrassingly parallel: one process each,
+            # capped at the core count. Imported lazily like the extractor.
+            import os
+            from concurrent.futures import ProcessPoolExecutor
+            from functools import partial
+
+            workers = min(len(args.input_path), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(
+                    partial(_extract_one, output_path=args.output_path, mode=args.mode),
+                    args.input_path,
+                ))
+        else:
+            # Deferred so --help and argument errors skip the fitz/Pillow load
+            from pdf_image_extraction.core.extractor import PDFExtractor
+
+            extractor = PDFExtractor(input_path=args.input_path)
+            extractor.extract_all(out_name=args.output_path, mode=args.mode)
 
         if args.verbose:
             print("Extraction completed successfully!")
@@ -1,9 +1,22 @@
 """Core image extraction utilities."""
 
-from .extractor import PDFExtractor
-from .image_embedded import ImageEmbedded
-
 __all__ = [
     "PDFExtractor",
     "ImageEmbedded",
 ]
+
+# Submodule that provides each lazily imported attribute (PEP 562).
+_LAZY_IMPORTS = {
+    "PDFExtractor": ".extractor",
+    "ImageEmbedded": ".image_embedded",
+}
+
+
+def __getattr__(name):
+    """Import the core classes lazily on first attribute access."""
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
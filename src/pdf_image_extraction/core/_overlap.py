@@ -0,0 +1,124 @@
+"""
+Scalar overlap kernel for bounding-box comparisons.
+
+Mirrors the geometry of ``extractor.check_overlap`` but operates on plain
+float coordinates instead of fitz.Point/fitz.Rect objects, so the hot
+pairwise loops never cross into the PyMuPDF bindings. When numba is
+installed the kernel is JIT-compiled; otherwise the same function runs as
+pure Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional: fall back to the interpreter
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def _point_dist2(ax, ay, bx, by):
+    """Squared Euclidean distance between two points."""
+    dx = ax - bx
+    dy = ay - by
+    return dx * dx + dy * dy
+
+
+@njit(cache=True, fastmath=True)
+def _point_rect_dist2(px, py, x0, y0, x1, y1):
+    """Squared Euclidean distance from a point to a rectangle (0 if inside)."""
+    dx = max(x0 - px, px - x1, 0.0)
+    dy = max(y0 - py, py - y1, 0.0)
+    return dx * dx + dy * dy
+
+
+@njit(cache=True, fastmath=True)
+def overlap_coords(x0i, y0i, x1i, y1i, x0j, y0j, x1j, y1j, distance, distance_bbox):
+    """
+    Check if two bounding boxes overlap, given their raw coordinates.
+
+    Same decision sequence as ``extractor.check_overlap``: identical boxes
+    are not considered overlapping, containment is, then edge proximities
+    and point-to-box distances are tested against the two thresholds.
+    Distances are compared in squared form, which is equivalent for these
+    strict inequalities and skips every square root.
+    """
+    # Boxes at the exact same location
+    if x0i == x0j and y0i == y0j and x1i == x1j and y1i == y1j:
+        return False
+
+    # Containment either way
+    if (x0j <= x0i and y0j <= y0i and x1i <= x1j and y1i <= y1j) or \
+       (x0i <= x0j and y0i <= y0j and x1j <= x1i and y1j <= y1i):
+        return True
+
+    # All comparisons are strict "< threshold", so squared distances
+    # against squared thresholds are equivalent and skip every sqrt
+    d2 = distance * distance
+    db2 = distance_bbox * distance_bbox
+
+    # Corner points: p = box i, q = box j
+    # p0/q0 top-left, p1/q1 top-right, p2/q2 bottom-left, p3/q3 bottom-right
+
+    # Edge proximities
+    if (_point_dist2(x1i, y0i, x0j, y0j) < d2 and
+            _point_dist2(x1i, y1i, x0j, y1j) < d2):
+        return True
+    if (_point_dist2(x0i, y0i, x1j, y0j) < d2 and
+            _point_dist2(x0i, y1i, x1j, y1j) < d2):
+        return True
+    if (_point_dist2(x0i, y0i, x0j, y1j) < d2 and
+            _point_dist2(x1i, y0i, x1j, y1j) < d2):
+        return True
+    if (_point_dist2(x0i, y1i, x0j, y0j) < d2 and
+            _point_dist2(x1i, y1i, x1j, y0j) < d2):
+        return True
+
+    # Bbox distances
+    if (_point_rect_dist2(x1i, y0i, x0j, y0j, x1j, y1j) < db2 and
+            _point_rect_dist2(x1i, y1i, x0j, y0j, x1j, y1j) < db2 and
+            (_point_dist2(x1i, y0i, x0j, y0j) < db2 or
+             _point_dist2(x1i, y1i, x0j, y1j) < db2)):
+        return True
+    if (_point_rect_dist2(x0i, y0i, x0j, y0j, x1j, y1j) < db2 and
+            _point_rect_dist2(x0i, y1i, x0j, y0j, x1j, y1j) < db2 and
+            (_point_dist2(x0i, y0i, x1j, y0j) < db2 or
+             _point_dist2(x0i, y1i, x1j, y1j) < db2)):
+        return True
+    if (_point_rect_dist2(x0i, y0i, x0j, y0j, x1j, y1j) < db2 and
+            _point_rect_dist2(x1i, y0i, x0j, y0j, x1j, y1j) < db2 and
+            (_point_dist2(x0i, y0i, x0j, y1j) < db2 or
+             _point_dist2(x1i, y0i, x1j, y1j) < db2)):
+        return True
+    if (_point_rect_dist2(x0i, y1i, x0j, y0j, x1j, y1j) < db2 and
+            _point_rect_dist2(x1i, y1i, x0j, y0j, x1j, y1j) < db2 and
+            (_point_dist2(x0i, y1i, x0j, y0j) < db2 or
+             _point_dist2(x1i, y1i, x1j, y0j) < db2)):
+        return True
+
+    return False
+
+
+@njit(cache=True, fastmath=True)
+def overlap_pairs_mask(coords, pairs_i, pairs_j, distance, distance_bbox):
+    """
+    Overlap decisions for candidate index pairs over an (N, 4) bbox array.
+
+    Runs the scalar kernel over every (pairs_i[k], pairs_j[k]) pair in one
+    compiled loop, so the caller crosses into this module once per batch
+    instead of once per pair.
+    """
+    out = np.empty(pairs_i.shape[0], dtype=np.bool_)
+    for k in range(pairs_i.shape[0]):
+        i = pairs_i[k]
+        j = pairs_j[k]
+        out[k] = overlap_coords(coords[i, 0], coords[i, 1], coords[i, 2], coords[i, 3],
+                                coords[j, 0], coords[j, 1], coords[j, 2], coords[j, 3],
+                                distance, distance_bbox)
+    return out
@@ -1,6 +1,9 @@
 """Constants for PDF image extraction."""
 
-# Extraction modes
+# Valid extraction mode names (frozenset: cheap immutable membership tests)
+VALID_MODES = frozenset(('safe', 'normal', 'unsafe'))
+
+# Human-readable mode descriptions, only consulted for help/error output
 EXTRACTION_MODES = {
     'safe': 'Safe mode - Extract only xreferred images',
     'normal': 'Normal mode - Extract with duplicate and corruption handling',
@@ -21,6 +24,13 @@ EXTRACTION_TIMEOUT = 600
 # Default extraction output format
 DEFAULT_IMAGE_FORMAT = 'PNG'
 
+# zlib level for saved PNGs: 1 keeps writes CPU-cheap while shrinking
+# files dramatically versus storing them uncompressed
+PNG_COMPRESS_LEVEL = 1
+
+# Byte budget for the per-document xref -> RGB pixmap cache
+PIXMAP_CACHE_BYTES = 64 * 1024 * 1024
+
 # Colorspace names
 COLORSPACE_GRAY = 'DeviceGray'
 COLORSPACE_RGB = 'DeviceRGB'
@@ -12,27 +12,80 @@ Author: Joao Phillipe Cardenuto - University of Campinas (UNICAMP)
 Email: phillipe.cardenuto@gmail.com
 """
 
+import bisect
+import gc
+import hashlib
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from glob import glob
-import signal
+from operator import attrgetter
+import multiprocessing
 import shutil
 import io
 
 import numpy as np
 import fitz
-from PIL import Image, ImageOps, ImageChops
+from PIL import Image, ImageOps
 
 from .image_embedded import ImageEmbedded
+from ._overlap import overlap_coords, overlap_pairs_mask
 from .constants import (
-    EXTRACTION_MODES, MIN_IMAGE_WIDTH, MIN_IMAGE_HEIGHT,
+    EXTRACTION_MODES, VALID_MODES, MIN_IMAGE_WIDTH, MIN_IMAGE_HEIGHT,
+    PNG_COMPRESS_LEVEL, PIXMAP_CACHE_BYTES,
     OVERLAP_DISTANCE, OVERLAP_DISTANCE_BBOX, EXTRACTION_TIMEOUT,
     COLORSPACE_GRAY, COLORSPACE_RGB, COLORSPACE_CMYK
 )
 
 
-def handler_timeout(signum, frame):
-    """Signal handler for extraction timeout."""
-    raise TimeoutError("TIMEOUT!")
+# Parses "p-<page>-x0-<x0>-y0-<y0>-x1-<x1>-y1-<y1>-<counter>.png" in one scan
+_NAME_RE = re.compile(
+    r'p-(\d+)-x0-(-?\d+\.\d+)-y0-(-?\d+\.\d+)-x1-(-?\d+\.\d+)-y1-(-?\d+\.\d+)-(\d+)\.png$'
+)
+
+
+def _run_normal_mode(pdf_path, dir_path):
+    """Run normal mode on one PDF; child-process target for the timeout."""
+    PDFExtractor(pdf_path).normal_mode(dir_path=dir_path, pdf=pdf_path)
+
+
+def _run_safe_mode(pdf_path, dir_path):
+    """Run safe mode on one PDF; child-process target for the timeout."""
+    PDFExtractor(pdf_path).safe_mode(dir_path=dir_path, pdf=pdf_path)
+
+
+def _extract_one(pdf, in_path, out_name, mode):
+    """
+    Extract a single PDF in a worker process.
+
+    Module-level so it stays picklable for ProcessPoolExecutor; each worker
+    builds its own PDFExtractor and runs the per-PDF body for the mode.
+
+    Parameters
+    ----------
+    pdf : str
+        PDF filename.
+    in_path : str
+        Directory containing the PDF.
+    out_name : str
+        Output directory for extracted images.
+    mode : str
+        Extraction mode ('safe', 'normal', or 'unsafe').
+    """
+    extractor = PDFExtractor(f"{in_path}/{pdf}")
+    extractor._mode_runner(mode)(pdf, in_path, out_name)
+
+
+# Ordering used while assembling overlapping figures; attrgetter is a
+# C-level callable, so sorts skip a Python frame per element
+_ASSEMBLY_KEY = attrgetter('x1', 'y1', 'x0', 'y0')
+
+
+def _ensure_png_mode(img):
+    """Return the image in a mode PNG output expects (RGB/RGBA/L)."""
+    if img.mode in ('RGB', 'RGBA', 'L'):
+        return img
+    return img.convert('RGB')
 
 
 def get_rectangles_points(bbox):
@@ -64,43 +117,34 @@ def check_overlap(bboxi, bboxj, distance=OVERLAP_DISTANCE, distance_bbox=OVERLAP
     bool
         True if bounding boxes overlap, False otherwise.
     """
-    p0, p1, p2, p3 = get_rectangles_points(bboxi)
-    q0, q1, q2, q3 = get_rectangles_points(bboxj)
+    return overlap_coords(bboxi.x0, bboxi.y0, bboxi.x1, bboxi.y1,
+                          bboxj.x0, bboxj.y0, bboxj.x1, bboxj.y1,
+                          distance, distance_bbox)
 
-    # Check if boxes are at the same location
-    if (p0.distance_to(q0) == 0 and p1.distance_to(q1) == 0 and
-            p2.distance_to(q2) == 0 and p3.distance_to(q3) == 0):
-        return False
 
-    # Check containment
-    if bboxi in bboxj or bboxj in bboxi:
-        return True
+class _DSU:
+    """Disjoint-set union with path halving and union by rank."""
 
-    # Check edge proximities
-    if (p1.distance_to(q0) < distance and p3.distance_to(q2) < distance):
-        return True
-    if (p0.distance_to(q1) < distance and p2.distance_to(q3) < distance):
-        return True
-    if (p0.distance_to(q2) < distance and p1.distance_to(q3) < distance):
-        return True
-    if (p2.distance_to(q0) < distance and p3.distance_to(q1) < distance):
-        return True
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
 
-    # Check bbox distances
-    if (p1.distance_to(bboxj) < distance_bbox and p3.distance_to(bboxj) < distance_bbox and
-            (p1.distance_to(q0) < distance_bbox or p3.distance_to(q2) < distance_bbox)):
-        return True
-    if (p0.distance_to(bboxj) < distance_bbox and p2.distance_to(bboxj) < distance_bbox and
-            (p0.distance_to(q1) < distance_bbox or p2.distance_to(q3) < distance_bbox)):
-        return True
-    if (p0.distance_to(bboxj) < distance_bbox and p1.distance_to(bboxj) < distance_bbox and
-            (p0.distance_to(q2) < distance_bbox or p1.distance_to(q3) < distance_bbox)):
-        return True
-    if (p2.distance_to(bboxj) < distance_bbox and p3.distance_to(bboxj) < distance_bbox and
-            (p2.distance_to(q0) < distance_bbox or p3.distance_to(q1) < distance_bbox)):
-        return True
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
-    return False
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return
+        if self.rank[root_i] < self.rank[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        if self.rank[root_i] == self.rank[root_j]:
+            self.rank[root_i] += 1
 
 
 class PDFExtractor:
@@ -135,6 +179,17 @@ class PDFExtractor:
         self.pdf_files = []
         self.img_counter = 0
         self.doc = None
+        # Per-file (mode, size, extrema, digest) cache so postprocessing
+        # decodes each extracted PNG at most once
+        self._img_cache = {}
+        # Per-document xref -> RGB pixmap cache (see _get_rgb_pixmap)
+        self._pixmap_cache = {}
+        # Per-document xref -> pixmap colorspace name, so overlap checks
+        # never decode an image stream just to compare colorspaces
+        self._xref_cs_cache = {}
+        # zlib level for saved PNGs; tune per instance if output size or
+        # write speed matters more than the default trade-off
+        self.png_compress_level = PNG_COMPRESS_LEVEL
 
         # Handle list input
         if isinstance(input_path, list):
@@ -143,12 +198,9 @@ class PDFExtractor:
             if len(input_path) > 1:
                 for pdf in input_path:
                     if pdf.lower().endswith(".pdf"):
-                        if "/" in pdf:
-                            self.pdf_files.append(pdf[pdf.rfind("/") + 1:])
-                            self.input_path.append(pdf[:pdf.rfind("/")])
-                        else:
-                            self.pdf_files.append(pdf)
-                            self.input_path.append(".")
+                        directory, filename = os.path.split(pdf)
+                        self.pdf_files.append(filename)
+                        self.input_path.append(directory or ".")
                     else:
                         print(f"{pdf} is not in *.PDF format")
             else:
@@ -159,12 +211,9 @@ class PDFExtractor:
             if input_path.lower().endswith(".pdf"):
                 self.pdf_files = []
                 self.input_path = []
-                if "/" in input_path:
-                    self.pdf_files.append(input_path[input_path.rfind("/") + 1:])
-                    self.input_path.append(input_path[:input_path.rfind("/")])
-                else:
-                    self.pdf_files.append(input_path)
-                    self.input_path.append(".")
+                directory, filename = os.path.split(input_path)
+                self.pdf_files.append(filename)
+                self.input_path.append(directory or ".")
             else:
                 self.input_path = input_path
                 self.pdf_files = self.get_local_pdf()
@@ -188,19 +237,25 @@ class PDFExtractor:
         """
         if input_path is None:
             input_path = self.input_path
-        
-        pdf_files = []
-        for filename in os.listdir(input_path):
-            if filename.lower().endswith(".pdf"):
-                pdf_files.append(filename)
-        
+
+        # scandir streams entries instead of materializing the full listing
+        with os.scandir(input_path) as entries:
+            pdf_files = [
+                entry.name for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(".pdf")
+            ]
+
         pdf_files.sort(key=str.lower)
         return pdf_files
 
-    def extract_all(self, input_path=None, out_name='.', mode='normal'):
+    def extract_all(self, input_path=None, out_name='.', mode='normal', max_workers=None):
         """
         Extract all images from all PDFs.
 
+        Multiple PDFs are independent, so they are distributed over a
+        ProcessPoolExecutor; a single PDF (or max_workers=1) runs serially
+        in-process.
+
         Parameters
         ----------
         input_path : str or list, optional
@@ -209,6 +264,8 @@ class PDFExtractor:
             Output directory for extracted images. Default is current directory.
         mode : str, optional
             Extraction mode ('safe', 'normal', or 'unsafe'). Default is 'normal'.
+        max_workers : int, optional
+            Worker process count. Defaults to min(cpu count, number of PDFs).
 
         Raises
         ------
@@ -217,7 +274,7 @@ class PDFExtractor:
         IOError
             If output path is not a directory.
         """
-        if mode not in self.operations_mode:
+        if mode not in VALID_MODES:
             raise ValueError(f"Invalid mode: {mode}. Must be one of {self.operations_mode}")
 
         if isinstance(out_name, list):
@@ -229,78 +286,136 @@ class PDFExtractor:
         if input_path is None:
             input_path = self.input_path
 
-        if mode == 'normal':
-            self._extract_all_normal(input_path, out_name)
-        elif mode == 'safe':
-            self._extract_all_safe(input_path, out_name)
-        else:  # unsafe
-            self._extract_all_unsafe(input_path, out_name)
+        jobs = [
+            (pdf, input_path[index] if isinstance(input_path, list) else input_path)
+            for index, pdf in enumerate(self.pdf_files)
+        ]
+
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, len(jobs))
+
+        if max_workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_extract_one, pdf, in_path, out_name, mode)
+                    for pdf, in_path in jobs
+                ]
+                for future in as_completed(futures):
+                    future.result()
+        else:
+            # Bind the mode-specific runner once instead of re-testing the
+            # mode string for every PDF in the batch
+            extract = self._mode_runner(mode)
+            for pdf, in_path in jobs:
+                extract(pdf, in_path, out_name)
 
         print("Extraction Done!")
 
-    def _extract_all_normal(self, input_path, out_name):
-        """Extract all PDFs using normal mode with timeout handling."""
-        for index, pdf in enumerate(self.pdf_files):
-            in_path = input_path[index] if isinstance(input_path, list) else input_path
-            print(f"Processing: {pdf}")
+    def _run_mode_with_timeout(self, target, pdf_path, dir_path):
+        """
+        Run a mode worker in a child process with a hard timeout.
+
+        Unlike SIGALRM, terminating the process also stops MuPDF C calls
+        that never return to the interpreter.
 
+        Returns
+        -------
+        bool
+            True if the worker exited cleanly within EXTRACTION_TIMEOUT.
+
+        Raises
+        ------
+        TimeoutError
+            If the worker had to be terminated at the timeout.
+        """
+        proc = multiprocessing.Process(target=target, args=(pdf_path, dir_path))
+        proc.start()
+        try:
+            proc.join(EXTRACTION_TIMEOUT)
+        except KeyboardInterrupt:
+            proc.terminate()
+            proc.join()
+            raise
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+            raise TimeoutError("TIMEOUT!")
+        return proc.exitcode == 0
+
+    def _mode_runner(self, mode):
+        """Return the bound per-PDF extraction method for a mode name."""
+        return {'normal': self._extract_pdf_normal,
+                'safe': self._extract_pdf_safe,
+                'unsafe': self._extract_pdf_unsafe}[mode]
+
+    def _extract_pdf_normal(self, pdf, in_path, out_name):
+        """Extract one PDF using normal mode with timeout handling."""
+        print(f"Processing: {pdf}")
+        pdf_path = f"{in_path}/{pdf}"
+        dir_path = f"{out_name}/{pdf[:-4]}"
+
+        try:
             try:
-                signal.signal(signal.SIGALRM, handler_timeout)
-                signal.alarm(EXTRACTION_TIMEOUT)
-                self.normal_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
-            except KeyboardInterrupt:
-                signal.alarm(0)
-                raise
+                if self._run_mode_with_timeout(_run_normal_mode, pdf_path, dir_path):
+                    return
+                print(f"{pdf} can't be extracted with normal mode. Trying safe mode...")
             except TimeoutError:
-                try:
-                    print(f"{pdf} is taking too much time. Trying safe mode...")
-                    if os.path.isdir(f"{out_name}/{pdf[:-4]}"):
-                        shutil.rmtree(f"{out_name}/{pdf[:-4]}")
-                    self.safe_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
-                except Exception:
-                    if os.path.isdir(f"{out_name}/{pdf[:-4]}"):
-                        shutil.rmtree(f"{out_name}/{pdf[:-4]}")
-                    print(f"Can't complete extraction of {pdf}")
-            except Exception:
-                try:
-                    signal.alarm(0)
-                    signal.signal(signal.SIGALRM, handler_timeout)
-                    signal.alarm(EXTRACTION_TIMEOUT)
-                    print(f"{pdf} can't be extracted with normal mode. Trying safe mode...")
-                    if os.path.isdir(f"{out_name}/{pdf[:-4]}"):
-                        shutil.rmtree(f"{out_name}/{pdf[:-4]}")
-                    self.safe_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
-                except Exception:
-                    if os.path.isdir(f"{out_name}/{pdf[:-4]}"):
-                        shutil.rmtree(f"{out_name}/{pdf[:-4]}")
-                    print(f"Can't complete extraction of {pdf}")
-            finally:
-                signal.alarm(0)
-                self.posprocessing_extraction(dir_path=f"{out_name}/{pdf[:-4]}")
-
-    def _extract_all_safe(self, input_path, out_name):
-        """Extract all PDFs using safe mode."""
-        for index, pdf in enumerate(self.pdf_files):
-            in_path = input_path[index] if isinstance(input_path, list) else input_path
-            print(f"Processing: {pdf}")
+                print(f"{pdf} is taking too much time. Trying safe mode...")
 
             try:
-                self.safe_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
-            except Exception as e:
-                print(f"Can't complete extraction of {pdf} using safe mode: {e}")
-                raise
+                if os.path.isdir(dir_path):
+                    shutil.rmtree(dir_path)
+                if not self._run_mode_with_timeout(_run_safe_mode, pdf_path, dir_path):
+                    raise IOError(f"safe mode failed for {pdf}")
+            except Exception:
+                if os.path.isdir(dir_path):
+                    shutil.rmtree(dir_path)
+                print(f"Can't complete extraction of {pdf}")
+        finally:
+            self.posprocessing_extraction(dir_path=dir_path)
 
-    def _extract_all_unsafe(self, input_path, out_name):
-        """Extract all PDFs using unsafe mode."""
-        for index, pdf in enumerate(self.pdf_files):
-            in_path = input_path[index] if isinstance(input_path, list) else input_path
-            print(f"Processing: {pdf}")
+    def _extract_pdf_safe(self, pdf, in_path, out_name):
+        """Extract one PDF using safe mode."""
+        print(f"Processing: {pdf}")
 
-            try:
-                self.unsafe_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
-            except Exception as e:
-                print(f"Can't extract using unsafe mode: {e}")
-                raise
+        try:
+            self.safe_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
+        except Exception as e:
+            print(f"Can't complete extraction of {pdf} using safe mode: {e}")
+            raise
+
+    def _extract_pdf_unsafe(self, pdf, in_path, out_name):
+        """Extract one PDF using unsafe mode."""
+        print(f"Processing: {pdf}")
+
+        try:
+            self.unsafe_mode(dir_path=f"{out_name}/{pdf[:-4]}", pdf=f"{in_path}/{pdf}")
+        except Exception as e:
+            print(f"Can't extract using unsafe mode: {e}")
+            raise
+
+    def _img_info(self, img_path):
+        """
+        Cached (mode, size, extrema, digest) tuple for an image file.
+
+        Parameters
+        ----------
+        img_path : str
+            Path to image file.
+
+        Returns
+        -------
+        tuple
+            (mode, size, extrema, blake2b digest of the raw pixels).
+        """
+        info = self._img_cache.get(img_path)
+        if info is None:
+            img = Image.open(img_path)
+            img.load()
+            info = (img.mode, img.size, img.getextrema(),
+                    hashlib.blake2b(img.tobytes(), digest_size=16).digest())
+            self._img_cache[img_path] = info
+        return info
 
     def is_single_color(self, img_path):
         """
@@ -316,8 +431,23 @@ class PDFExtractor:
         bool
             True if image is single color, False otherwise.
         """
-        img = Image.open(img_path)
-        extrema = img.getextrema()
+        if img_path not in self._img_cache:
+            # Probe a 64x64 corner tile first: any variation there proves
+            # the image is not single-color without a full decode
+            img = Image.open(img_path)
+            img.draft(img.mode, (64, 64))
+            corner = img.crop((0, 0, min(img.width, 64), min(img.height, 64)))
+            extrema = corner.getextrema()
+            if len(extrema) >= 3:
+                monochrome_corner = all(
+                    band_extrema[0] == band_extrema[1] for band_extrema in extrema
+                )
+            else:
+                monochrome_corner = extrema[0] == extrema[1]
+            if not monochrome_corner:
+                return False
+
+        extrema = self._img_info(img_path)[2]
 
         if len(extrema) >= 3:
             return all(band_extrema[0] == band_extrema[1] for band_extrema in extrema)
@@ -340,40 +470,50 @@ class PDFExtractor:
         tuple
             (bool, str or None) - (are_equal, path_to_delete)
         """
-        img_i = Image.open(img_path_i)
-        img_j = Image.open(img_path_j)
+        mode_i, size_i, _, digest_i = self._img_info(img_path_i)
+        mode_j, size_j, _, digest_j = self._img_info(img_path_j)
 
-        if img_i.size != img_j.size:
+        if size_i != size_j:
             return False, None
 
-        img_i.load()
-        img_j.load()
-
-        if img_i.mode != img_j.mode:
-            if img_j.mode == 'L':
+        if mode_i != mode_j:
+            if mode_j == 'L':
                 return True, img_path_j
-            if img_i.mode == 'L':
+            if mode_i == 'L':
                 return True, img_path_i
 
-        if img_i.mode == img_j.mode:
-            if img_i.mode == 'L':
+        if mode_i == mode_j:
+            if mode_i == 'L':
                 last = sorted([img_path_i, img_path_j],
                             key=lambda x: int(x[x.rfind("-"):-4]), reverse=True)
                 return True, last[1]
-            else:
-                if ImageChops.difference(img_i, img_j).getbbox() is None:
+            elif digest_i == digest_j:
+                # Digests match: confirm with a raw-bytes memcmp, which is
+                # cheaper than materializing an ImageChops difference image
+                img_i = Image.open(img_path_i)
+                img_j = Image.open(img_path_j)
+                if img_i.tobytes() == img_j.tobytes():
                     return True, img_path_i
 
         return False, None
 
     def isclose_infos(self, img_i, img_j):
         """Check if two image info tuples are close in coordinates."""
-        return all(np.isclose(img_i[i], img_j[i]) for i in range(5))
+        return bool(np.isclose(img_i[:5], img_j[:5]).all())
+
+    @staticmethod
+    def _spatial_key(info, tol=1.0):
+        """Spatial hash key (page + grid cell) for a parsed filename info tuple."""
+        return (info[0], int(info[1] // tol), int(info[2] // tol))
 
     def posprocessing_extraction(self, dir_path):
         """
         Eliminate duplicate and single-color images from extraction.
 
+        Duplicate candidates are pruned with a spatial hash keyed by page
+        and a 1pt grid cell over (x0, y0), so only images whose bboxes can
+        actually satisfy the closeness test get compared pairwise.
+
         Parameters
         ----------
         dir_path : str
@@ -385,36 +525,66 @@ class PDFExtractor:
         imgs_names = glob(f"{dir_path}/*.png")
         imgs_names.sort(key=lambda x: int(x[x.rfind("-"):-4]), reverse=True)
 
-        # Parse image info from filenames
+        # Parse image info from filenames (single regex scan per name)
         imgs_infos = [
-            (int(img[img.find("/p-") + 3:img.find("-x0-")]),
-             float(img[img.find("-x0-") + 4:img.find("-y0-")]),
-             float(img[img.find("-y0-") + 4:img.find("-x1-")]),
-             float(img[img.find("-x1-") + 4:img.find("-y1-")]),
-             float(img[img.find("-y1-") + 4:img.rfind("-")]),
-             index)
+            (int(m[1]), float(m[2]), float(m[3]), float(m[4]), float(m[5]), index)
             for index, img in enumerate(imgs_names)
+            if (m := _NAME_RE.search(img))
         ]
 
-        while imgs_infos:
-            img_i = imgs_infos.pop(0)
+        buckets = {}
+        for pos, info in enumerate(imgs_infos):
+            buckets.setdefault(self._spatial_key(info), []).append(pos)
 
-            # Remove single-color images
-            if self.is_single_color(imgs_names[img_i[5]]):
-                os.remove(imgs_names[img_i[5]])
+        alive = [True] * len(imgs_infos)
+
+        for pos, _ in enumerate(imgs_infos):
+            if not alive[pos]:
+                continue
+            img_i = imgs_infos[pos]
+            alive[pos] = False
+
+            # Remove single-color images (cheap: metadata comes from cache)
+            name_i = imgs_names[img_i[5]]
+            if self.is_single_color(name_i):
+                os.remove(name_i)
+                self._img_cache.pop(name_i, None)
                 continue
 
-            # Check for duplicates
-            for index, img_j in enumerate(imgs_infos):
-                if self.isclose_infos(img_i, img_j):
-                    delete, delete_image_name = self.is_equal_imgs(
-                        imgs_names[img_i[5]], imgs_names[img_j[5]]
-                    )
-                    if delete:
-                        if delete_image_name == imgs_names[img_j[5]]:
-                            imgs_infos[index] = img_i
-                        os.remove(delete_image_name)
-                        break
+            # Gather duplicate candidates from the cell and its 8 neighbors
+            page, cx, cy = self._spatial_key(img_i)
+            candidates = set()
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    candidates.update(buckets.get((page, cx + dx, cy + dy), ()))
+
+            cand = [j for j in sorted(candidates) if j > pos and alive[j]]
+            if not cand:
+                continue
+
+            # One vectorized closeness test over all candidates at once
+            # instead of five scalar np.isclose calls per pair
+            cand_arr = np.array([imgs_infos[j][:5] for j in cand])
+            close_mask = np.isclose(cand_arr, np.array(img_i[:5])).all(axis=1)
+
+            for pos_j, is_close in zip(cand, close_mask):
+                if not is_close:
+                    continue
+                img_j = imgs_infos[pos_j]
+                delete, delete_image_name = self.is_equal_imgs(
+                    imgs_names[img_i[5]], imgs_names[img_j[5]]
+                )
+                if delete:
+                    if delete_image_name == imgs_names[img_j[5]]:
+                        # img_i survives: it takes over img_j's slot and
+                        # is compared again from there
+                        imgs_infos[pos_j] = img_i
+                        key_i = self._spatial_key(img_i)
+                        if key_i != self._spatial_key(img_j):
+                            buckets.setdefault(key_i, []).append(pos_j)
+                    os.remove(delete_image_name)
+                    self._img_cache.pop(delete_image_name, None)
+                    break
 
     def unsafe_mode(self, pdf, dir_path=None):
         """
@@ -441,14 +611,41 @@ class PDFExtractor:
                 all_image_from_page = [t for t in page_contents['blocks'] if t['type'] == 1]
 
                 for img_data in all_image_from_page:
+                    # Fast path: decode and write through MuPDF's native
+                    # pixmap writer, skipping the PIL decode/encode pass
+                    try:
+                        pix = fitz.Pixmap(img_data['image'])
+                    except Exception:
+                        pix = None
+
+                    if pix is not None and not pix.alpha:
+                        if pix.width < MIN_IMAGE_WIDTH or pix.height < MIN_IMAGE_HEIGHT:
+                            continue
+
+                        name = f"{extraction_path}/p-{page + 1}-{self.img_counter}.png"
+
+                        # Convert CMYK to RGB
+                        if pix.colorspace and pix.colorspace.name == COLORSPACE_CMYK:
+                            pix = fitz.Pixmap(fitz.csRGB, pix)
+
+                        pix.save(name)
+                        pix = None
+                        self.img_counter += 1
+                        continue
+
+                    # PIL fallback: alpha compositing onto white, or streams
+                    # MuPDF could not open directly
+                    # Image.open only parses the header, so the size gate
+                    # rejects thumbnails before the full decode in load()
                     img = Image.open(io.BytesIO(img_data['image']))
-                    img.load()
 
                     if img.width < MIN_IMAGE_WIDTH or img.height < MIN_IMAGE_HEIGHT:
                         continue
 
+                    img.load()
+
                     name = f"{extraction_path}/p-{page + 1}-{self.img_counter}.png"
-                    
+
                     # Convert CMYK to RGB
                     if img.mode == 'CMYK':
                         img = img.convert('RGB')
@@ -460,9 +657,9 @@ class PDFExtractor:
                     # Convert other modes to RGB if needed
                     elif img.mode not in ('RGB', 'L'):
                         img = img.convert('RGB')
-                    
+
                     # Save without compression to preserve raw image data
-                    img.save(name, compress_level=0)
+                    img.save(name, compress_level=self.png_compress_level)
                     self.img_counter += 1
         finally:
             self.doc.close()
@@ -485,7 +682,9 @@ class PDFExtractor:
             os.mkdir(extraction_path)
 
         self.doc = fitz.open(pdf)
-        xrefs_checked = []
+        self._pixmap_cache = {}
+        self._xref_cs_cache = {}
+        xrefs_checked = set()
 
         try:
             for page in range(len(self.doc)):
@@ -498,19 +697,15 @@ class PDFExtractor:
                     smask = img[1]
 
                     if smask != 0:  # Has stencil mask
-                        pix1 = fitz.Pixmap(self.doc, xref)
-                        
-                        # Convert CMYK to RGB if needed BEFORE adding alpha
-                        if pix1.colorspace and pix1.colorspace.name == COLORSPACE_CMYK:
-                            pix1 = fitz.Pixmap(fitz.csRGB, pix1)
-                        
+                        # CMYK is converted to RGB (cached) BEFORE adding alpha
+                        pix1 = self._get_rgb_pixmap(xref)
                         pix2 = fitz.Pixmap(self.doc, smask)
                         pix = fitz.Pixmap(pix1)
                         pix.set_alpha(pix2.samples)
 
                         if self.write_img(pix, f"{extraction_path}/p-{page + 1}-{self.img_counter}.png"):
                             self.img_counter += 1
-                            xrefs_checked.append(xref)
+                            xrefs_checked.add(xref)
 
                         pix = pix1 = pix2 = None
                     else:  # No stencil mask
@@ -518,7 +713,7 @@ class PDFExtractor:
 
                         if self.write_img(pix, f"{extraction_path}/p-{page + 1}-{self.img_counter}.png", img[5]):
                             self.img_counter += 1
-                            xrefs_checked.append(xref)
+                            xrefs_checked.add(xref)
 
                         pix = None
         finally:
@@ -544,46 +739,26 @@ class PDFExtractor:
             os.mkdir(extraction_path)
 
         self.doc = fitz.open(pdf)
-        xrefs_checked = []
+        self._pixmap_cache = {}
+        self._xref_cs_cache = {}
+        xrefs_checked = set()
+
+        # One xref-table walk per page, shared with the unmatched-image
+        # pass, and one extract_image decode per unique xref
+        images_per_page = [self.doc[p].get_images(full=True) for p in range(len(self.doc))]
+        extract_cache = {}
 
         try:
             for page in range(len(self.doc)):
-                page_contents = self.doc[page].get_text("dict")
-                all_image_from_page = [t for t in page_contents['blocks'] if t['type'] == 1]
-                xreferred_image_list = []
+                # Per-page work lives in its own frame so page content and
+                # the image list are released before the next page loads
+                self._process_page(page, images_per_page[page], extract_cache,
+                                   xrefs_checked, extraction_path)
 
-                # Build list of xreferred images
-                for img in self.doc[page].get_images(full=True):
-                    xref = img[0]
-                    extract_img = self.doc.extract_image(xref)
-
-                    if xref in xrefs_checked:
-                        continue
-
-                    # Handle images with alpha
-                    if extract_img["smask"] > 0:
-                        self._handle_alpha_image(page, xref, extract_img, img, all_image_from_page,
-                                               xreferred_image_list, xrefs_checked, extraction_path)
-                        continue
-
-                    pix = fitz.Pixmap(self.doc, xref)
-                    if pix.colorspace is None:
-                        continue
-
-                    # Match extracted image with page content
-                    self._match_page_content(page, xref, extract_img, img, all_image_from_page,
-                                            xreferred_image_list, xrefs_checked)
-
-                # Process unmatched images
-                if not xreferred_image_list and all_image_from_page:
-                    self._process_unmatched_images(page, all_image_from_page, xrefs_checked,
-                                                  xreferred_image_list)
-
-                # Handle overlapping images
-                if len(xreferred_image_list) > 1:
-                    self._handle_overlapping_images(page, xreferred_image_list, extraction_path)
-                elif xreferred_image_list:
-                    self._save_single_image(page, xreferred_image_list[0], extraction_path)
+                # MuPDF buffers can sit in reference cycles; sweep them
+                # periodically to keep peak RSS to roughly one page
+                if (page + 1) % 16 == 0:
+                    gc.collect()
 
         except KeyboardInterrupt:
             self.doc.close()
@@ -593,32 +768,122 @@ class PDFExtractor:
             print("NORMAL MODE FAILS")
             raise
 
+    def _process_page(self, page, page_images, extract_cache, xrefs_checked, extraction_path):
+        """Run the normal-mode matching and saving passes for one page."""
+        page_contents = self.doc[page].get_text("dict")
+        all_image_from_page = [t for t in page_contents['blocks'] if t['type'] == 1]
+        xreferred_image_list = []
+
+        # Build list of xreferred images
+        for img in page_images:
+            xref = img[0]
+            extract_img = self._extract_image_cached(xref, extract_cache)
+
+            if xref in xrefs_checked:
+                continue
+
+            # Handle images with alpha
+            if extract_img["smask"] > 0:
+                self._handle_alpha_image(page, xref, extract_img, img, all_image_from_page,
+                                       xreferred_image_list, xrefs_checked, extraction_path)
+                continue
+
+            pix = fitz.Pixmap(self.doc, xref)
+            no_colorspace = pix.colorspace is None
+            pix = None
+            if no_colorspace:
+                continue
+
+            # Match extracted image with page content
+            self._match_page_content(page, xref, extract_img, img, all_image_from_page,
+                                    xreferred_image_list, xrefs_checked)
+
+        # Process unmatched images
+        if not xreferred_image_list and all_image_from_page:
+            self._process_unmatched_images(page_images, all_image_from_page,
+                                          xrefs_checked, xreferred_image_list,
+                                          extract_cache)
+
+        # Handle overlapping images
+        if len(xreferred_image_list) > 1:
+            self._handle_overlapping_images(page, xreferred_image_list, extraction_path)
+        elif xreferred_image_list:
+            self._save_single_image(page, xreferred_image_list[0], extraction_path)
+
+    @staticmethod
+    def _block_pixel_key(p_img):
+        """
+        Decoded (width, height, digest) key for a page image block.
+
+        Cached on the block dict itself so repeated alpha lookups on the
+        same page decode each block at most once.
+        """
+        key = p_img.get('_pixel_key', False)
+        if key is False:
+            try:
+                block = Image.open(io.BytesIO(p_img['image']))
+                block.load()
+                key = (block.width, block.height,
+                       hashlib.blake2b(block.tobytes(), digest_size=16).digest())
+            except Exception:
+                key = None
+            p_img['_pixel_key'] = key
+        return key
+
+    def _get_rgb_pixmap(self, xref):
+        """
+        Pixmap for an xref, converted from CMYK to RGB when needed.
+
+        Xrefs reused across pages (logos, journal headers) skip the
+        C-level colorspace conversion after the first hit. The cache is
+        bounded: oldest entries are evicted once the cached pixmaps
+        exceed PIXMAP_CACHE_BYTES.
+        """
+        pix = self._pixmap_cache.get(xref)
+        if pix is None:
+            pix = fitz.Pixmap(self.doc, xref)
+            if pix.colorspace and pix.colorspace.name == COLORSPACE_CMYK:
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            self._pixmap_cache[xref] = pix
+            total = sum(p.size for p in self._pixmap_cache.values())
+            while total > PIXMAP_CACHE_BYTES and len(self._pixmap_cache) > 1:
+                oldest = next(iter(self._pixmap_cache))
+                total -= self._pixmap_cache.pop(oldest).size
+        return pix
+
     def _handle_alpha_image(self, page, xref, extract_img, img, all_image_from_page,
                            xreferred_image_list, xrefs_checked, extraction_path):
         """Handle images with alpha channels."""
-        pix_img = fitz.Pixmap(self.doc, xref)
-
-        if pix_img.colorspace and pix_img.colorspace.name == COLORSPACE_CMYK:
-            pix_img = fitz.Pixmap(fitz.csRGB, pix_img)
-
-        aux_img = pix_img.tobytes('png')
-        pix_img = None
+        pix_img = self._get_rgb_pixmap(xref)
+
+        # Matching blocks must decode to the same raw pixels, so compare
+        # cheap pixel keys first and only PNG-encode the pixmap to confirm
+        # an actual candidate (instead of re-encoding unconditionally)
+        pix_key = (pix_img.width, pix_img.height,
+                   hashlib.blake2b(pix_img.samples, digest_size=16).digest())
+        aux_img = None
         found = False
 
         for p_img in all_image_from_page:
+            if self._block_pixel_key(p_img) != pix_key:
+                continue
+            if aux_img is None:
+                aux_img = pix_img.tobytes('png')
             if p_img['image'] == aux_img:
                 xreferred_image_list.append(
                     ImageEmbedded(xref, p_img['bbox'], extract_img, alt_colorspace=img[5], doc=self.doc)
                 )
-                xrefs_checked.append(xref)
+                xrefs_checked.add(xref)
                 found = True
                 break
 
+        pix_img = None
+
         if not found:
             xreferred_image_list.append(
                 ImageEmbedded(xref, None, extract_img, alt_colorspace=img[5], doc=self.doc)
             )
-            xrefs_checked.append(xref)
+            xrefs_checked.add(xref)
 
     def _match_page_content(self, page, xref, extract_img, img, all_image_from_page,
                            xreferred_image_list, xrefs_checked):
@@ -645,23 +910,32 @@ class PDFExtractor:
                         ImageEmbedded(xref, all_image_from_page[index]['bbox'], extract_img,
                                     alt_colorspace=img[5], doc=self.doc)
                     )
-                    xrefs_checked.append(xref)
+                    xrefs_checked.add(xref)
                     all_image_from_page.pop(index)
                     continue
 
             index += 1
 
-    def _process_unmatched_images(self, page, all_image_from_page, xrefs_checked, xreferred_image_list):
+    def _extract_image_cached(self, xref, cache):
+        """doc.extract_image with per-document memoization by xref."""
+        extract_img = cache.get(xref)
+        if extract_img is None:
+            extract_img = self.doc.extract_image(xref)
+            cache[xref] = extract_img
+        return extract_img
+
+    def _process_unmatched_images(self, page_images, all_image_from_page, xrefs_checked,
+                                  xreferred_image_list, extract_cache):
         """Process images that weren't matched to xrefs."""
         index = 0
-        for img in self.doc[page].get_images(full=True):
+        for img in page_images:
             xref = img[0]
 
             if xref in xrefs_checked or index >= len(all_image_from_page):
                 index += 1
                 continue
 
-            extract_img = self.doc.extract_image(xref)
+            extract_img = self._extract_image_cached(xref, extract_cache)
 
             if extract_img["smask"] > 0:
                 xreferred_image_list.append(
@@ -693,12 +967,8 @@ class PDFExtractor:
 
     def _save_alpha_overlapped_image(self, page, figure, extraction_path):
         """Save an overlapped image with alpha channel."""
-        pix1 = fitz.Pixmap(self.doc, figure.xref)
-        
-        # Convert CMYK to RGB if needed BEFORE adding alpha
-        if pix1.colorspace and pix1.colorspace.name == COLORSPACE_CMYK:
-            pix1 = fitz.Pixmap(fitz.csRGB, pix1)
-        
+        # CMYK is converted to RGB (cached) BEFORE adding alpha
+        pix1 = self._get_rgb_pixmap(figure.xref)
         pix2 = fitz.Pixmap(self.doc, figure.smask)
         pix = fitz.Pixmap(pix1)
         pix.set_alpha(pix2.samples)
@@ -719,12 +989,8 @@ class PDFExtractor:
     def _save_single_image(self, page, figure, extraction_path):
         """Save a single image."""
         if figure.has_alpha():
-            pix1 = fitz.Pixmap(self.doc, figure.xref)
-            
-            # Convert CMYK to RGB if needed BEFORE adding alpha
-            if pix1.colorspace and pix1.colorspace.name == COLORSPACE_CMYK:
-                pix1 = fitz.Pixmap(fitz.csRGB, pix1)
-            
+            # CMYK is converted to RGB (cached) BEFORE adding alpha
+            pix1 = self._get_rgb_pixmap(figure.xref)
             pix2 = fitz.Pixmap(self.doc, figure.smask)
             pix = fitz.Pixmap(pix1)
             pix.set_alpha(pix2.samples)
@@ -777,21 +1043,38 @@ class PDFExtractor:
         if isinstance(img_data, Image.Image):
             img = img_data
         else:
+            # Lazy open: only the header is parsed here, so the size and
+            # mode checks below don't force a full decode
             img = Image.open(io.BytesIO(img_data))
-            img.load()
 
         if img.size[0] < MIN_IMAGE_WIDTH or img.size[1] < MIN_IMAGE_HEIGHT:
             return False
 
-        background = Image.new("RGB", img.size, (255, 255, 255))
-        # Ensure img has alpha channel
+        if (not isinstance(img_data, Image.Image)
+                and img.format == 'PNG'
+                and img.mode not in ('RGBA', 'LA', 'PA')
+                and 'transparency' not in img.info):
+            # Already-encoded PNG bytes with no alpha to flatten: write
+            # them straight to disk instead of decoding and re-running
+            # the whole Deflate/filter pipeline
+            with open(name, 'wb') as fp:
+                fp.write(img_data)
+            del img
+            return True
+
         if img.mode not in ('RGBA', 'LA', 'PA'):
-            # If no alpha channel, just paste directly
-            background.paste(img)
+            # No alpha channel: white background is fully covered anyway
+            background = img.convert("RGB")
         else:
-            background.paste(img, mask=img.split()[-1])  # Use last channel as mask (alpha)
-        # Save without compression to preserve raw image data
-        background.save(name, compress_level=0)
+            # Composite over white in one vectorized pass; integer math
+            # (rgb*a + 255*(255-a)) // 255 avoids the per-band images that
+            # split()/paste() would allocate
+            arr = np.asarray(img.convert('RGBA'), dtype=np.uint8)
+            rgb = arr[..., :3].astype(np.uint16)
+            a = arr[..., 3:4].astype(np.uint16)
+            out = ((rgb * a + 255 * (255 - a)) // 255).astype(np.uint8)
+            background = Image.fromarray(out, 'RGB')
+        background.save(name, compress_level=self.png_compress_level)
         del background
         del img
 
@@ -835,7 +1118,7 @@ class PDFExtractor:
                         pix.invertIRect()
                     # Convert to PIL and save without compression
                     pil_img = pix.pil_image()
-                    pil_img.save(file_name, compress_level=0)
+                    pil_img.save(file_name, compress_level=self.png_compress_level)
                     return True
 
             elif colorspace_name == COLORSPACE_RGB:
@@ -846,7 +1129,7 @@ class PDFExtractor:
                 else:
                     # Convert to PIL and save without compression
                     pil_img = pix.pil_image()
-                    pil_img.save(file_name, compress_level=0)
+                    pil_img.save(file_name, compress_level=self.png_compress_level)
                     return True
 
             elif colorspace_name == COLORSPACE_CMYK:
@@ -858,12 +1141,10 @@ class PDFExtractor:
                     png_bytes = pixRGB.tobytes('png')
                     return self.write_alpha_imgs(png_bytes, file_name)
                 else:
-                    # Convert to PIL and save without compression
+                    # Already RGB after the pixmap conversion above, so no
+                    # second Pillow-side mode conversion is needed
                     pil_img = pixRGB.pil_image()
-                    # Ensure it's RGB format (not CMYK)
-                    if pil_img.mode == 'CMYK':
-                        pil_img = pil_img.convert('RGB')
-                    pil_img.save(file_name, compress_level=0)
+                    pil_img.save(file_name, compress_level=self.png_compress_level)
                     return True
 
             else:
@@ -874,7 +1155,7 @@ class PDFExtractor:
                     # Ensure it's RGB format
                     if pil_img.mode not in ('RGB', 'RGBA'):
                         pil_img = pil_img.convert('RGB')
-                    pil_img.save(file_name, compress_level=0)
+                    pil_img.save(file_name, compress_level=self.png_compress_level)
                     return True
                 except Exception as e:
                     print(f"Warning: Could not convert colorspace {colorspace_name}: {e}")
@@ -885,6 +1166,91 @@ class PDFExtractor:
         except KeyboardInterrupt:
             raise
 
+    @staticmethod
+    def _attr_codes(values):
+        """Integer codes for a list of hashable attribute values."""
+        table = {}
+        return np.array([table.setdefault(v, len(table)) for v in values])
+
+    @staticmethod
+    def _grid_candidate_pairs(coords, eligible):
+        """
+        Candidate index pairs (i < j) from a uniform grid over the page.
+
+        Each eligible bbox, padded by the overlap distance, registers in
+        every grid cell it touches; only figures sharing a cell become
+        candidates. Cell size tracks the median bbox diagonal so typical
+        boxes span only a few cells.
+        """
+        indices = np.nonzero(eligible)[0]
+        if indices.size < 2:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        x0, y0, x1, y1 = coords[indices].T
+        cell = max(float(np.median(np.hypot(x1 - x0, y1 - y0))), 1.0)
+        pad = OVERLAP_DISTANCE
+
+        buckets = {}
+        for idx, bx0, by0, bx1, by1 in zip(indices, x0, y0, x1, y1):
+            for cx in range(int((bx0 - pad) // cell), int((bx1 + pad) // cell) + 1):
+                for cy in range(int((by0 - pad) // cell), int((by1 + pad) // cell) + 1):
+                    buckets.setdefault((cx, cy), []).append(idx)
+
+        pairs = set()
+        for members in buckets.values():
+            for a in range(len(members) - 1):
+                for b in range(a + 1, len(members)):
+                    pairs.add((members[a], members[b]))
+
+        if not pairs:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        pair_arr = np.array(sorted(pairs), dtype=np.intp)
+        return pair_arr[:, 0], pair_arr[:, 1]
+
+    def _overlapping_pairs(self, figures):
+        """
+        Index pairs (i < j) of figures that has_overlap would accept.
+
+        A grid broad-phase keeps the candidate count near-linear in the
+        number of figures, the attribute filters (alpha, filter,
+        colorspace) run as vectorized equality tests over integer-coded
+        arrays, and the exact overlap kernel only sees the survivors.
+        Pixmap colorspaces are resolved once per xref, not once per pair.
+        """
+        eligible = np.array([fig.bbox is not None and not fig.has_alpha()
+                             for fig in figures])
+        coords = np.array([(fig.x0, fig.y0, fig.x1, fig.y1) if fig.bbox is not None
+                           else (0.0, 0.0, 0.0, 0.0) for fig in figures])
+
+        cand_i, cand_j = self._grid_candidate_pairs(coords, eligible)
+        if not cand_i.size:
+            return cand_i, cand_j
+
+        cs = self._attr_codes([fig.colorspace for fig in figures])
+        alt = self._attr_codes([fig.alt_colorspace for fig in figures])
+        filt = self._attr_codes([fig.filter for fig in figures])
+        has_xref = np.array([bool(fig.xref) for fig in figures])
+
+        # Pixmap colorspace by name, one lookup per unique xref
+        pix_cs = self._attr_codes([
+            self._xref_colorspace_name(fig.xref) if fig.xref else None
+            for fig in figures
+        ])
+
+        both_xref = has_xref[cand_i] & has_xref[cand_j]
+        keep = ((cs[cand_i] == cs[cand_j]) &
+                (alt[cand_i] == alt[cand_j]) &
+                (~both_xref | (filt[cand_i] == filt[cand_j])) &
+                (~both_xref | (pix_cs[cand_i] == pix_cs[cand_j])))
+        cand_i, cand_j = cand_i[keep], cand_j[keep]
+
+        if cand_i.size:
+            mask = overlap_pairs_mask(coords, cand_i, cand_j,
+                                      OVERLAP_DISTANCE, OVERLAP_DISTANCE_BBOX)
+            cand_i, cand_j = cand_i[mask], cand_j[mask]
+
+        return cand_i, cand_j
+
     def build_overlap_set(self, figures):
         """
         Build sets of overlapping figures.
@@ -899,92 +1265,80 @@ class PDFExtractor:
         list
             List of sets containing indices of overlapping images.
         """
-        overlap_set = [set() for _ in range(len(figures))]
-
+        # Connected components over the overlapping pairs in near-linear
+        # time; groups come out keyed by their smallest member, matching
+        # the order the old restart-based set merging produced
+        dsu = _DSU(len(figures))
+        for i, j in zip(*self._overlapping_pairs(figures)):
+            dsu.union(int(i), int(j))
+
+        groups = {}
         for i in range(len(figures)):
-            for j in range(i, len(figures)):
-                if self.has_overlap(figures, i, j):
-                    overlap_set[i].add(j)
-
-        self.union_intersections_images(overlap_set)
+            groups.setdefault(dsu.find(i), set()).add(i)
+        overlap_set = list(groups.values())
 
-        while True:
-            old_len_set = len(overlap_set)
-            overlap_set = self.union_region_fig_overlap(figures, overlap_set)
-            if old_len_set == len(overlap_set):
-                break
-
-        return overlap_set
+        return self.union_region_fig_overlap(figures, overlap_set)
 
     def union_region_fig_overlap(self, figures, overlap_set):
-        """Union overlapping figure regions."""
+        """Union groups whose merged bounding regions overlap on the page."""
         overlap_figs = []
-
-        for index, set_figs in enumerate(overlap_set):
-            list_figs = list(set_figs)
-            valid_index_bbox = 0
-            stop_index = 0
-
-            for lists_index, figures_index in enumerate(list_figs):
+        for set_figs in overlap_set:
+            union_region = None
+            for figures_index in sorted(set_figs):
                 if figures[figures_index].bbox:
-                    valid_index_bbox = lists_index
-                    stop_index = lists_index
-                    break
-
-            if stop_index <= len(list_figs) - 1 and figures[list_figs[valid_index_bbox]].bbox:
-                union_region = figures[list_figs[valid_index_bbox]].copy()
-                for fig in list_figs[valid_index_bbox:]:
-                    union_region.bbox.include_rect(figures[fig].bbox)
-                overlap_figs.append(union_region)
-            else:
-                overlap_figs.append(ImageEmbedded(None, None))
-
-        restart_union_search = True
-        while restart_union_search:
-            restart_union_search = False
-            for i in range(len(overlap_figs)):
-                if restart_union_search:
-                    break
-                for j in range(i, len(overlap_figs)):
-                    if i != j and self.has_overlap(overlap_figs, i, j):
-                        if not self.same_location_bbox_used(overlap_set[i], overlap_set[j], figures):
-                            overlap_figs[i].bbox.include_rect(overlap_figs[j].bbox)
-                            overlap_set[i] = overlap_set[i].union(overlap_set[j])
-                            overlap_figs.pop(j)
-                            overlap_set.pop(j)
-                            restart_union_search = True
-                            break
+                    if union_region is None:
+                        union_region = figures[figures_index].copy()
+                    else:
+                        union_region.bbox.include_rect(figures[figures_index].bbox)
+            overlap_figs.append(union_region if union_region is not None
+                                else ImageEmbedded(None, None))
+
+        # Corner coordinates once per call, not once per candidate pair
+        corners = self._figure_corners(figures)
+
+        # A merge grows a region, which may create new overlaps with
+        # regions already visited, so sweep until a pass makes no merge
+        # (instead of restarting the whole scan after every merge)
+        merged = True
+        while merged:
+            merged = False
+            i = 0
+            while i < len(overlap_figs):
+                j = i + 1
+                while j < len(overlap_figs):
+                    if (self.has_overlap(overlap_figs, i, j) and
+                            not self.same_location_bbox_used(overlap_set[i], overlap_set[j], corners)):
+                        overlap_figs[i].bbox.include_rect(overlap_figs[j].bbox)
+                        overlap_set[i] = overlap_set[i].union(overlap_set[j])
+                        overlap_figs.pop(j)
+                        overlap_set.pop(j)
+                        merged = True
+                    else:
+                        j += 1
+                i += 1
 
-        self.union_intersections_images(overlap_set)
         return overlap_set
 
-    def same_location_bbox_used(self, set_i, set_j, figures):
-        """Check if two sets of figures share the same location."""
-        for fig_i in set_i:
-            for fig_j in set_j:
-                p0_i, p1_i, p2_i, p3_i = get_rectangles_points(figures[fig_i].bbox)
-                p0_j, p1_j, p2_j, p3_j = get_rectangles_points(figures[fig_j].bbox)
-
-                if (p0_i.distance_to(p0_j) == 0 and p1_i.distance_to(p1_j) == 0 and
-                        p2_i.distance_to(p2_j) == 0 and p3_i.distance_to(p3_j) == 0):
-                    return True
-
-        return False
+    @staticmethod
+    def _figure_corners(figures):
+        """
+        (N, 4, 2) array of bbox corner coordinates for all figures.
 
-    def union_intersections_images(self, overlap_set):
-        """Union sets that have intersections."""
-        restart_union_search = True
-        while restart_union_search:
-            restart_union_search = False
-            for i in range(len(overlap_set)):
-                if restart_union_search:
-                    break
-                for j in range(i, len(overlap_set)):
-                    if bool(set.intersection(overlap_set[i], overlap_set[j])) and i != j:
-                        overlap_set[i] = overlap_set[i].union(overlap_set[j])
-                        del overlap_set[j]
-                        restart_union_search = True
-                        break
+        Figures without a bbox get NaN corners, which never compare equal
+        and so never count as sharing a location.
+        """
+        corners = np.full((len(figures), 4, 2), np.nan)
+        for index, fig in enumerate(figures):
+            if fig.bbox:
+                corners[index] = ((fig.bbox.x0, fig.bbox.y0), (fig.bbox.x1, fig.bbox.y0),
+                                  (fig.bbox.x0, fig.bbox.y1), (fig.bbox.x1, fig.bbox.y1))
+        return corners
+
+    def same_location_bbox_used(self, set_i, set_j, corners):
+        """Check if any figure in set_i shares its exact corners with one in set_j."""
+        corners_i = corners[list(set_i)]
+        corners_j = corners[list(set_j)]
+        return bool(np.any(np.all(corners_i[:, None] == corners_j[None, :], axis=(2, 3))))
 
     def assembly_image(self, figures, file_name):
         """
@@ -1011,7 +1365,13 @@ class PDFExtractor:
         not_found = 1
 
         try:
-            figures.sort(key=lambda x: (x.x1, x.y1, x.x0, x.y0))
+            # Sort once up front; merged results are insorted back into
+            # place and an unmatched head rotates to the tail, so the loop
+            # never needs a full re-sort. np.lexsort on a packed key array
+            # orders by C comparisons on floats instead of Python-level
+            # attribute tuples
+            keys = np.array([(fig.x1, fig.y1, fig.x0, fig.y0) for fig in figures])
+            figures[:] = [figures[i] for i in np.lexsort(keys.T[::-1])]
 
             while len(figures) > 1:
                 obj_i = figures.pop(0)
@@ -1020,7 +1380,7 @@ class PDFExtractor:
                     if check_overlap(obj_i.bbox, obj_j.bbox, distance):
                         res_img, res_obj = self.merge_images(obj_i, obj_j, file_name)
                         figures.pop(index_j)
-                        figures.append(res_obj)
+                        bisect.insort(figures, res_obj, key=_ASSEMBLY_KEY)
                         not_found = 0
                         break
 
@@ -1030,12 +1390,7 @@ class PDFExtractor:
                         img_i = self._load_image(obj_i)
                         full_file_name = (f"{file_name}x0-{obj_i.x0:.3f}-y0-{obj_i.y0:.3f}-"
                                          f"x1-{obj_i.x1:.3f}-y1-{obj_i.y1:.3f}-{self.img_counter}.png")
-                        # Ensure image is in RGB mode before saving as PNG
-                        if img_i.mode == 'CMYK':
-                            img_i = img_i.convert('RGB')
-                        elif img_i.mode not in ('RGB', 'RGBA', 'L'):
-                            img_i = img_i.convert('RGB')
-                        img_i.save(full_file_name, compress_level=0)
+                        _ensure_png_mode(img_i).save(full_file_name, compress_level=self.png_compress_level)
                         self.img_counter += 1
                         continue
 
@@ -1044,7 +1399,6 @@ class PDFExtractor:
                     not_found = 0
 
                 if not_found:
-                    figures.sort(key=lambda x: (x.x1, x.y1, x.x0, x.y0))
                     figures.append(obj_i)
 
                 not_found += 1
@@ -1055,12 +1409,7 @@ class PDFExtractor:
 
                 full_file_name = (f"{file_name}x0-{res_obj.x0:.3f}-y0-{res_obj.y0:.3f}-"
                                  f"x1-{res_obj.x1:.3f}-y1-{res_obj.y1:.3f}-{self.img_counter}.png")
-                # Ensure image is in RGB mode before saving as PNG
-                if res_img.mode == 'CMYK':
-                    res_img = res_img.convert('RGB')
-                elif res_img.mode not in ('RGB', 'RGBA', 'L'):
-                    res_img = res_img.convert('RGB')
-                res_img.save(full_file_name, compress_level=0)
+                _ensure_png_mode(res_img).save(full_file_name, compress_level=self.png_compress_level)
                 return True
             else:
                 raise ValueError("Assembly failed")
@@ -1081,9 +1430,15 @@ class PDFExtractor:
         if obj.colorspace != 3 and pix.colorspace and pix.alpha == 0:
             pix = fitz.Pixmap(fitz.csRGB, pix)
 
-        byte_img = pix.tobytes('png')
-        img = Image.open(io.BytesIO(byte_img))
-        img.load()
+        # Hand Pillow the raw samples directly; the PNG round-trip spent a
+        # full Deflate encode plus decode per figure load
+        mode = {(1, 0): 'L', (2, 1): 'LA', (3, 0): 'RGB',
+                (4, 1): 'RGBA', (4, 0): 'CMYK'}.get((pix.n, pix.alpha))
+        if mode is not None:
+            img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        else:
+            img = Image.open(io.BytesIO(pix.tobytes('png')))
+            img.load()
 
         if len(img.getbands()) == 1 and pix.colorspace is None:
             img = ImageOps.invert(img)
@@ -1122,11 +1477,15 @@ class PDFExtractor:
         sketch = fitz.Rect(obj_i.bbox)
         sketch.include_rect(obj_j.bbox)
 
-        real_w = [(sketch.width * obj.width) / (obj.x1 - obj.x0) for obj in [obj_i, obj_j]]
-        real_h = [(sketch.height * obj.height) / (obj.y1 - obj.y0) for obj in [obj_i, obj_j]]
+        # Plain scalar arithmetic: np.mean/np.round on two-element lists
+        # costs more in dispatch than the math itself
+        real_w_i = (sketch.width * obj_i.width) / (obj_i.x1 - obj_i.x0)
+        real_w_j = (sketch.width * obj_j.width) / (obj_j.x1 - obj_j.x0)
+        real_h_i = (sketch.height * obj_i.height) / (obj_i.y1 - obj_i.y0)
+        real_h_j = (sketch.height * obj_j.height) / (obj_j.y1 - obj_j.y0)
 
-        real_w = int(np.round(np.mean(real_w), 1))
-        real_h = int(np.round(np.mean(real_h), 1))
+        real_w = int(round((real_w_i + real_w_j) / 2, 1))
+        real_h = int(round((real_h_i + real_h_j) / 2, 1))
 
         # Calculate positions
         if obj_i.x0 < obj_j.x0:
@@ -1151,20 +1510,12 @@ class PDFExtractor:
             y0_j = 0
             y1_j = int(real_h * (obj_j.y1 - obj_j.y0) / sketch.height)
 
-        x0_i, y0_i, x1_i, y1_i = [int(x) for x in np.round([x0_i, y0_i, x1_i, y1_i], 3)]
-        x0_j, y0_j, x1_j, y1_j = [int(x) for x in np.round([x0_j, y0_j, x1_j, y1_j], 3)]
-
         # Check for overlapping conflicts
         if x0_i < x0_j and (x0_i + img_i.width - x0_j) > 10:
             if img_j.width > 10 and img_j.height > 10:
                 full_file_name = (f"{file_name}x0-{obj_j.x0:.3f}-y0-{obj_j.y0:.3f}-"
                                  f"x1-{obj_j.x1:.3f}-y1-{obj_j.y1:.3f}-{self.img_counter}.png")
-                # Ensure image is in RGB mode before saving as PNG
-                if img_j.mode == 'CMYK':
-                    img_j = img_j.convert('RGB')
-                elif img_j.mode not in ('RGB', 'RGBA', 'L'):
-                    img_j = img_j.convert('RGB')
-                img_j.save(full_file_name, compress_level=0)
+                _ensure_png_mode(img_j).save(full_file_name, compress_level=self.png_compress_level)
                 self.img_counter += 1
             return img_i, obj_i
 
@@ -1172,12 +1523,7 @@ class PDFExtractor:
             if img_i.width > 10 and img_i.height > 10:
                 full_file_name = (f"{file_name}x0-{obj_i.x0:.3f}-y0-{obj_i.y0:.3f}-"
                                  f"x1-{obj_i.x1:.3f}-y1-{obj_i.y1:.3f}-{self.img_counter}.png")
-                # Ensure image is in RGB mode before saving as PNG
-                if img_i.mode == 'CMYK':
-                    img_i = img_i.convert('RGB')
-                elif img_i.mode not in ('RGB', 'RGBA', 'L'):
-                    img_i = img_i.convert('RGB')
-                img_i.save(full_file_name, compress_level=0)
+                _ensure_png_mode(img_i).save(full_file_name, compress_level=self.png_compress_level)
                 self.img_counter += 1
             return img_j, obj_j
 
@@ -1185,12 +1531,7 @@ class PDFExtractor:
             if img_j.width > 10 and img_j.height > 10:
                 full_file_name = (f"{file_name}x0-{obj_j.x0:.3f}-y0-{obj_j.y0:.3f}-"
                                  f"x1-{obj_j.x1:.3f}-y1-{obj_j.y1:.3f}-{self.img_counter}.png")
-                # Ensure image is in RGB mode before saving as PNG
-                if img_j.mode == 'CMYK':
-                    img_j = img_j.convert('RGB')
-                elif img_j.mode not in ('RGB', 'RGBA', 'L'):
-                    img_j = img_j.convert('RGB')
-                img_j.save(full_file_name, compress_level=0)
+                _ensure_png_mode(img_j).save(full_file_name, compress_level=self.png_compress_level)
                 self.img_counter += 1
             return img_i, obj_i
 
@@ -1243,6 +1584,11 @@ class PDFExtractor:
         if img_i.bbox is None or img_j.bbox is None:
             return False
 
+        # Geometry first: a few float compares reject most pairs before
+        # any attribute or colorspace lookups
+        if not check_overlap(img_i.bbox, img_j.bbox):
+            return False
+
         if img_i.has_alpha() or img_j.has_alpha():
             return False
 
@@ -1256,10 +1602,14 @@ class PDFExtractor:
             return False
 
         if img_j.xref and img_i.xref:
-            pixi = fitz.Pixmap(self.doc, img_i.xref)
-            pixj = fitz.Pixmap(self.doc, img_j.xref)
-
-            if pixi.colorspace != pixj.colorspace:
+            if self._xref_colorspace_name(img_i.xref) != self._xref_colorspace_name(img_j.xref):
                 return False
 
-        return check_overlap(img_i.bbox, img_j.bbox)
+        return True
+
+    def _xref_colorspace_name(self, xref):
+        """Cached pixmap colorspace name for an xref (None if colorless)."""
+        if xref not in self._xref_cs_cache:
+            colorspace = fitz.Pixmap(self.doc, xref).colorspace
+            self._xref_cs_cache[xref] = colorspace.name if colorspace else None
+        return self._xref_cs_cache[xref]
@@ -5,6 +5,8 @@ Provides a clean API for integration with Docker and other services.
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from pdf_image_extraction.core import PDFExtractor
 
 
@@ -15,7 +17,7 @@ class ImageExtractorService:
     Provides a clean API for extracting images from PDFs with error handling.
     """
 
-    def __init__(self, extraction_mode='normal'):
+    def __init__(self, extraction_mode='normal', max_workers=None):
         """
         Initialize the service.
 
@@ -24,11 +26,15 @@ class ImageExtractorService:
         extraction_mode : str, optional
             Default extraction mode ('safe', 'normal', or 'unsafe').
             Default is 'normal'.
+        max_workers : int, optional
+            Worker process count for batch extraction. Defaults to the
+            CPU count.
         """
         if extraction_mode not in ['safe', 'normal', 'unsafe']:
             raise ValueError(f"Invalid extraction_mode: {extraction_mode}")
 
         self.extraction_mode = extraction_mode
+        self.max_workers = max_workers
 
     def extract_images(self, pdf_path, output_folder, mode=None):
         """
@@ -102,13 +108,30 @@ class ImageExtractorService:
         """
         results = {}
 
-        for pdf_path in pdf_list:
-            try:
-                images = self.extract_images(pdf_path, output_folder, mode)
-                results[pdf_path] = images
-            except IOError as e:
-                print(f"Error processing {pdf_path}: {e}")
-                results[pdf_path] = []
+        if len(pdf_list) <= 1:
+            for pdf_path in pdf_list:
+                try:
+                    results[pdf_path] = self.extract_images(pdf_path, output_folder, mode)
+                except IOError as e:
+                    print(f"Error processing {pdf_path}: {e}")
+                    results[pdf_path] = []
+            return results
+
+        # PDFs are independent and extraction is CPU-bound, so fan the
+        # batch out over worker processes
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(pdf_list))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.extract_images, pdf_path, output_folder, mode): pdf_path
+                for pdf_path in pdf_list
+            }
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    results[pdf_path] = future.result()
+                except IOError as e:
+                    print(f"Error processing {pdf_path}: {e}")
+                    results[pdf_path] = []
 
         return results
 
@@ -130,10 +153,10 @@ class ImageExtractorService:
         if not os.path.isdir(output_dir):
             return []
 
-        images = []
-        for filename in os.listdir(output_dir):
-            if filename.lower().endswith('.png'):
-                full_path = os.path.abspath(os.path.join(output_dir, filename))
-                images.append(full_path)
-
-        return sorted(images)
+        # One abspath on the directory instead of one per file; DirEntry
+        # paths then come out absolute for free. The extractor writes
+        # lowercase .png extensions, so no per-name lower() is needed.
+        abs_dir = os.path.abspath(output_dir)
+        with os.scandir(abs_dir) as entries:
+            return sorted(entry.path for entry in entries
+                          if entry.is_file() and entry.name.endswith('.png'))